@@ -0,0 +1,198 @@
+"""check_command() case tables shared by test_validators.py.
+
+Each table holds (cmd, id) pairs for one expected outcome:
+
+  blocked       decision="deny", should_block=True, reason contains "BLOCKED"
+  prompted      decision="ask", plain approval prompt (no WARNING)
+  non_matching  decision="allow", empty reason
+  suspicious    decision="ask", reason contains "WARNING"
+
+The first case of each table is also run on its own as the readable
+representative of its category.
+"""
+
+# ---------------------------------------------------------------------------
+# helm-validator.py
+# ---------------------------------------------------------------------------
+
+HELM_CWD = "/work/charts/myapp"
+
+HELM_CASES = {
+    "blocked": (
+        ("helm install myrelease mychart", "install"),
+        ("helm upgrade myrelease mychart", "upgrade"),
+        ("helm uninstall myrelease", "uninstall"),
+        ("helm delete myrelease", "delete"),
+        ("helm rollback myrelease 1", "rollback"),
+        ("helm test myrelease", "test"),
+        # Global flags between command and subcommand must not bypass the block
+        ("helm --namespace prod install myrelease mychart", "namespace-space"),
+        (
+            "helm --kube-context staging --namespace prod install myrelease mychart",
+            "multi-flags-space",
+        ),
+        ("helm --namespace=prod install myrelease mychart", "namespace-equals"),
+        ("helm --debug upgrade myrelease mychart", "debug-upgrade"),
+        (
+            "helm --kubeconfig /tmp/kubeconfig install myrelease mychart",
+            "kubeconfig-space",
+        ),
+        # Flags after the subcommand, pipes and quoting
+        ("helm install --namespace prod myrelease mychart", "flags-after"),
+        ("cat values.yaml | helm install myrelease -", "piped"),
+        ('helm "install" myrelease mychart', "quoted"),
+        # Case insensitivity
+        ("HELM INSTALL myrelease", "uppercase"),
+        ("Helm Upgrade myrelease mychart", "mixed-case"),
+    ),
+    "prompted": (
+        ("helm template myrelease .", "template"),
+        ("helm lint .", "lint"),
+        ("helm show values mychart", "show-values"),
+        ("helm show chart mychart", "show-chart"),
+        ("helm dependency update .", "dep-update"),
+        ("helm package .", "package"),
+        ("helm repo list", "repo-list"),
+        ("helm repo add bitnami https://charts.bitnami.com", "repo-add"),
+        ("helm search repo mychart", "search"),
+        ("helm version", "version"),
+        ("helm env", "env"),
+        ("helm template myrelease . -f values-prod.yaml", "template-values"),
+        ("HELM TEMPLATE myrelease .", "uppercase"),
+    ),
+    "non_matching": (
+        ("echo hello", "echo"),
+        ("kubectl apply -f manifest.yaml", "kubectl"),
+        ("terraform plan", "terraform"),
+        ("ls -la", "ls"),
+        ("git status", "git"),
+        # 'helm' as a substring of another word, or inside a commit message
+        ("helmsman apply", "substring"),
+        ("helmsman install", "helmsman"),
+        (
+            'git commit -m "docs: fix helm test references and audit log paths"',
+            "commit-message",
+        ),
+        (
+            'git add . && git commit -m "update helm install docs and test-hooks.sh"',
+            "chained-commit",
+        ),
+    ),
+    "suspicious": (
+        ('subcmd="install"; helm $subcmd', "variable-install"),
+        ('chart="upgrade"; helm $chart', "variable-upgrade"),
+        ("action=rollback; helm $action myrelease", "variable-rollback"),
+        # --set key=<blocked keyword> warns but is never denied
+        ("helm template myrelease . --set phase=install", "set-install"),
+        ("helm template myrelease . --set action=upgrade", "set-upgrade"),
+        ("helm --set phase=install template myrelease .", "set-before-subcommand"),
+        # Shell quoting and parameter expansion around the keyword
+        (r"helm \install x", "backslash-install"),
+        ("helm ${S:-install} x", "default-expansion-install"),
+        ("s=x-install; helm ${s#x-} r c", "hyphenated-install"),
+    ),
+}
+
+# ---------------------------------------------------------------------------
+# terraform-validator.py
+# ---------------------------------------------------------------------------
+
+TF_CWD = "/work/infra"
+
+TF_CASES = {
+    "blocked": (
+        ("terraform apply", "apply"),
+        ("terraform destroy", "destroy"),
+        ("terraform import aws_instance.foo i-1234", "import"),
+        ("terraform taint aws_instance.foo", "taint"),
+        ("terraform untaint aws_instance.foo", "untaint"),
+        ("terraform force-unlock LOCK_ID", "force-unlock"),
+        # State manipulation
+        ("terraform state rm aws_instance.foo", "state-rm"),
+        ("terraform state mv aws_instance.a aws_instance.b", "state-mv"),
+        ("terraform state push", "state-push"),
+        ("terraform state pull", "state-pull"),
+        # Aliases
+        ("tf apply", "tf-apply"),
+        ("tf destroy", "tf-destroy"),
+        ("tform apply", "tform-apply"),
+        ("tform destroy", "tform-destroy"),
+        ("tofu apply", "tofu-apply"),
+        ("tofu destroy", "tofu-destroy"),
+        ("tofu import aws_instance.foo i-1234", "tofu-import"),
+        ("tofu state rm aws_instance.foo", "tofu-state-rm"),
+        # Global flags between command and subcommand must not bypass the block
+        ("terraform -chdir=../prod apply", "chdir"),
+        ("terraform -chdir=../prod -no-color apply", "chdir-nocolor"),
+        ("tf -chdir=envs/staging destroy", "alias-chdir-destroy"),
+        # Flags after the subcommand, chains and pipes
+        ("terraform apply -auto-approve", "flags-after"),
+        ("terraform plan -out=tfplan && terraform apply tfplan", "chained"),
+        ("echo yes | terraform apply", "piped"),
+        # Shell punctuation glued to the subcommand
+        ("terraform 'apply'", "quoted"),
+        ("terraform apply>apply.log", "redirect"),
+        # Nested calls in command substitutions
+        ("terraform fmt $(terraform apply -auto-approve)", "nested-dollar-paren"),
+        ("terraform fmt `terraform destroy -auto-approve`", "nested-backtick"),
+        ('tf validate "$(tf state rm aws_instance.x)"', "nested-quoted-state-rm"),
+        ("terraform fmt <(terraform apply)", "nested-process-substitution"),
+        # Case insensitivity
+        ("TERRAFORM APPLY", "uppercase"),
+        ("Terraform Destroy", "mixed-case"),
+    ),
+    "prompted": (
+        ("terraform plan", "plan"),
+        ("terraform init", "init"),
+        ("terraform init -no-color", "init-nocolor"),
+        ("terraform plan -lock=false -no-color", "plan-lock-nocolor"),
+        ("terraform fmt", "fmt"),
+        ("terraform validate", "validate"),
+        ("terraform output", "output"),
+        ("terraform state list", "state-list"),
+        ("terraform state show aws_instance.foo", "state-show"),
+        ("terraform providers", "providers"),
+        ("tf plan", "tf-plan"),
+        ("tform init", "tform-init"),
+        ("tofu plan", "tofu-plan"),
+        ("tofu init -no-color", "tofu-init"),
+        # Blocked keywords inside variable names are neither denied nor warned
+        ("terraform plan -var='apply_immediately=true'", "var-apply-suffix"),
+        ("terraform plan -var='auto_destroy=false'", "var-destroy-substring"),
+        ("TERRAFORM PLAN", "uppercase"),
+    ),
+    "non_matching": (
+        ("echo hello", "echo"),
+        ("kubectl apply -f manifest.yaml", "kubectl"),
+        ("ls -la", "ls"),
+        ("git status", "git"),
+        ("helm install myrelease mychart", "helm"),
+        ("python terraform_helper.py", "python-script"),
+        ("cat stuff.txt", "tf-substring"),
+        # 'terraform' as a substring of another word, or inside a commit message
+        ("terraformer generate aws", "substring"),
+        (
+            'git commit -m "docs: clarify terraform apply workflow and destroy risks"',
+            "commit-message",
+        ),
+        (
+            'git add . && git commit -m "remove stale terraform apply examples"',
+            "chained-commit",
+        ),
+    ),
+    "suspicious": (
+        ("cmd=apply; terraform $cmd", "variable-apply"),
+        ("terraform $(echo destroy)", "subshell-destroy"),
+        ("action=taint; tf $action resource", "variable-taint"),
+        # Shell quoting and parameter expansion around the keyword
+        (r"terraform \apply", "backslash-apply"),
+        ("terraform ${SUB:-apply}", "default-expansion-apply"),
+        ("cmd=pre-apply; terraform ${cmd#pre-}", "hyphenated-apply"),
+    ),
+}
+
+# (hook script, working directory, case tables) for each validator under test
+VALIDATORS = (
+    ("helm-validator.py", HELM_CWD, HELM_CASES),
+    ("terraform-validator.py", TF_CWD, TF_CASES),
+)
@@ -1,8 +1,60 @@
 """Shared pytest fixtures for hook tests."""
 
+import importlib.util
 import os
+import sys
+
 import pytest
 
+from _cases import VALIDATORS
+
+HOOKS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_hook_module(filename):
+    """Import a hook script by filename, executing it at most once.
+
+    Hook scripts have hyphens in their names, so they can't be imported
+    normally. The module is registered in sys.modules under an underscored
+    name (helm-validator.py -> helm_validator), so repeated calls share one
+    instance. The source loader still uses the __pycache__ bytecode cache.
+    """
+    name = filename.removesuffix(".py").replace("-", "_")
+    module = sys.modules.get(name)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(
+            name, os.path.join(HOOKS_DIR, filename)
+        )
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="session")
+def hook_utils():
+    """The shared hook_utils.py module (the same instance the hooks import)."""
+    return load_hook_module("hook_utils.py")
+
+
+@pytest.fixture(
+    scope="module",
+    params=VALIDATORS,
+    ids=lambda v: v[0].removesuffix("-validator.py"),
+)
+def validator(request):
+    """Each validator under test as (module, cwd, cases); see _cases.py.
+
+    The module is loaded once per session. Its log_command is swapped for a
+    no-op while its tests run, so no audit log is written.
+    """
+    filename, cwd, cases = request.param
+    module = load_hook_module(filename)
+    original = module.log_command
+    module.log_command = lambda *args, **kwargs: None
+    yield module, cwd, cases
+    module.log_command = original
+
 
 @pytest.fixture(autouse=True)
 def _suppress_container_warning():
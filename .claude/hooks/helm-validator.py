@@ -19,47 +19,76 @@ Usage:
 Author: SRE Platform Team
 """
 
-import json
 import sys
 import re
 import os
-from pathlib import Path
 
 # Allow import from the same directory when invoked as a standalone script.
-sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from hook_utils import (
-    get_dated_audit_log_path,
+    TOOL_NAMES,
+    find_keywords,
     get_tool_stages,
+    get_words,
     log_command,
+    run_validator_hook,
 )
 
-AUDIT_LOG = get_dated_audit_log_path("helm")
+# Audit log selector: entries go to .claude/audit/helm-YYYY-MM-DD.log
+TOOL_NAME = "helm"
 
-# Helm command name to catch
-#
-# NOTE: Shell aliases don't work in subprocess calls, so they can't bypass
-# hooks anyway. This catches the actual helm binary and wrapper scripts in PATH.
-HELM_COMMAND = r"\bhelm\b"
+# Helm command names to catch. Add wrapper scripts to TOOL_NAMES in
+# hook_utils.py, which helm-logger.py reads too.
+HELM_NAMES = TOOL_NAMES[TOOL_NAME]
 
+# Subcommands that are absolutely forbidden - these deploy to or mutate a
+# cluster and must go through GitOps (ArgoCD, Flux) or PR-driven CI/CD.
+#
 # Helm global flags may have space-separated values (e.g., --namespace prod),
-# so we skip arbitrary whitespace-delimited tokens between the command name and
-# subcommand using a non-greedy match. \b(?!=) prevents false positives when the
-# subcommand word appears as part of a key=value pair (e.g., --set phase=install).
-HELM_FLAGS_GAP = r"\s+(?:\S+\s+)*?"
-
-# Commands that are absolutely forbidden - these deploy to or mutate a cluster
-# and must go through GitOps (ArgoCD, Flux) or PR-driven CI/CD
-BLOCKED_COMMANDS = [
-    (rf"{HELM_COMMAND}{HELM_FLAGS_GAP}install\b(?!=)", "helm install"),
-    (rf"{HELM_COMMAND}{HELM_FLAGS_GAP}upgrade\b(?!=)", "helm upgrade"),
-    (rf"{HELM_COMMAND}{HELM_FLAGS_GAP}uninstall\b(?!=)", "helm uninstall"),
-    (rf"{HELM_COMMAND}{HELM_FLAGS_GAP}delete\b(?!=)", "helm delete"),
-    (rf"{HELM_COMMAND}{HELM_FLAGS_GAP}rollback\b(?!=)", "helm rollback"),
-    (rf"{HELM_COMMAND}{HELM_FLAGS_GAP}test\b(?!=)", "helm test"),
+# so the subcommand is not necessarily the first non-flag word: every word
+# after the command name is checked. Words are compared whole, so a key=value
+# pair (e.g., --set phase=install) never matches.
+BLOCKED_SUBCOMMANDS = {
+    "install": "helm install",
+    "upgrade": "helm upgrade",
+    "uninstall": "helm uninstall",
+    "delete": "helm delete",
+    "rollback": "helm rollback",
+    "test": "helm test",
+}
+
+# Extra rules that can't be expressed as a subcommand name (e.g. a flag),
+# as (compiled regex, display name) pairs. Each is searched in every stage
+# where helm is the executable, after the subcommand lookup. Stages are
+# lowercased, so write lowercase patterns without re.IGNORECASE. Empty by
+# default; see .claude/docs/DEPLOYMENT.md for an example.
+BLOCKED_PATTERNS = [
+    # (re.compile(r"(^|\s)--force\b"), "helm with --force flag"),
 ]
 
-# Pattern to identify any helm command
-HELM_PATTERN = HELM_COMMAND
+# Blocked subcommand keywords that may appear via indirection (variables, eval)
+SUSPICIOUS_KEYWORDS = ("install", "upgrade", "uninstall", "delete", "rollback")
+
+
+def find_blocked(stage):
+    """Return the display name of the blocked command run by stage, or None.
+
+    Scans the stage's words once, looking up every word after the helm
+    command name in BLOCKED_SUBCOMMANDS. Then tries BLOCKED_PATTERNS.
+    """
+    words = get_words(stage)
+    after_helm = False
+    for word in words:
+        if after_helm:
+            name = BLOCKED_SUBCOMMANDS.get(word)
+            if name:
+                return name
+        elif word in HELM_NAMES:
+            after_helm = True
+    for pattern, name in BLOCKED_PATTERNS:
+        if pattern.search(stage):
+            return name
+    return None
 
 
 def check_command(command, cwd):
@@ -77,38 +106,38 @@ def check_command(command, cwd):
             should_block: If True, command is completely blocked
     """
 
+    # Lowercase once; every check below works on this copy, while the reason
+    # and audit log keep the command as written.
+    cmd_lower = command.lower()
+
     # Only validate commands where helm is actually the executable in at
     # least one pipeline stage. This prevents false positives when 'helm'
     # appears as text inside arguments (e.g. commit messages, file paths).
-    tool_stages = get_tool_stages(command, HELM_PATTERN)
+    tool_stages = get_tool_stages(cmd_lower, HELM_NAMES)
     if not tool_stages:
         return ("allow", "", False)
 
-    # Check blocked patterns against tool stages only (not the full command
+    # Check for blocked subcommands in tool stages only (not the full command
     # string) to avoid matching blocked keywords in unrelated text.
     for stage in tool_stages:
-        for pattern, name in BLOCKED_COMMANDS:
-            if re.search(pattern, stage, re.IGNORECASE):
-                reason = (
-                    f"BLOCKED: {name} is not allowed.\n\n"
-                    f"This command deploys to or mutates a cluster and must go through "
-                    f"your GitOps workflow (ArgoCD, Flux, or PR-driven CI/CD).\n\n"
-                    f"For local development, use:\n"
-                    f"  helm template <chart>    # Render templates locally\n"
-                    f"  helm lint <chart>        # Validate chart structure\n\n"
-                    f"Working directory: {cwd}"
-                )
-                log_command(AUDIT_LOG, command, "BLOCKED", cwd, f"Blocked: {name}")
-                return ("deny", reason, True)
+        name = find_blocked(stage)
+        if name:
+            reason = (
+                f"BLOCKED: {name} is not allowed.\n\n"
+                f"This command deploys to or mutates a cluster and must go through "
+                f"your GitOps workflow (ArgoCD, Flux, or PR-driven CI/CD).\n\n"
+                f"For local development, use:\n"
+                f"  helm template <chart>    # Render templates locally\n"
+                f"  helm lint <chart>        # Validate chart structure\n\n"
+                f"Working directory: {cwd}"
+            )
+            log_command(TOOL_NAME, command, "BLOCKED", cwd, f"Blocked: {name}")
+            return ("deny", reason, True)
 
     # Check if the command contains blocked subcommand keywords despite not
     # matching the structured block patterns. This catches indirect execution
     # via variables or eval (e.g., subcmd="install"; helm $subcmd).
-    suspicious = [
-        kw
-        for kw in ("install", "upgrade", "uninstall", "delete", "rollback")
-        if re.search(rf"\b{kw}\b", command, re.IGNORECASE)
-    ]
+    suspicious = find_keywords(cmd_lower, SUSPICIOUS_KEYWORDS)
 
     if suspicious:
         keywords = ", ".join(suspicious)
@@ -121,7 +150,7 @@ def check_command(command, cwd):
             f"blocked operation. Review the full command carefully before approving."
         )
         log_command(
-            AUDIT_LOG,
+            TOOL_NAME,
             command,
             "PENDING_APPROVAL_SUSPICIOUS",
             cwd,
@@ -135,7 +164,7 @@ def check_command(command, cwd):
             f"This prompt ensures you review each helm operation before execution."
         )
         log_command(
-            AUDIT_LOG, command, "PENDING_APPROVAL", cwd, "Awaiting user approval"
+            TOOL_NAME, command, "PENDING_APPROVAL", cwd, "Awaiting user approval"
         )
 
     return ("ask", reason, False)
@@ -143,38 +172,7 @@ def check_command(command, cwd):
 
 def main():
     """Main hook execution function."""
-    try:
-        input_data = json.load(sys.stdin)
-    except json.JSONDecodeError as e:
-        print(f"Error: Invalid JSON input from Claude Code: {e}", file=sys.stderr)
-        sys.exit(1)
-
-    tool_name = input_data.get("tool_name", "")
-    tool_input = input_data.get("tool_input", {})
-    command = tool_input.get("command", "")
-    cwd = input_data.get("cwd", os.getcwd())
-
-    if tool_name != "Bash":
-        sys.exit(0)
-
-    decision, reason, should_block = check_command(command, cwd)
-
-    response = {
-        "hookSpecificOutput": {
-            "hookEventName": "PreToolUse",
-            "permissionDecision": decision,
-            "permissionDecisionReason": reason,
-        }
-    }
-
-    print(json.dumps(response))
-
-    # Exit code 2 blocks command with error message
-    # Exit code 0 uses JSON response
-    if should_block:
-        sys.exit(2)
-
-    sys.exit(0)
+    run_validator_hook(check_command)
 
 
 if __name__ == "__main__":
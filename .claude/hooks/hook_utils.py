@@ -4,14 +4,92 @@ Shared utilities for Claude Code hook scripts.
 This module is imported by the validator and logger hooks. It contains
 functions that are identical across tools (terraform, helm) to avoid
 duplication.
+
+Every hook fires in a fresh python3 process, so import time is paid on every
+Bash tool call. Modules only needed when actually writing an audit entry
+(datetime) are imported lazily inside the functions that use them,
+keeping the common "not a terraform/helm command" path cheap.
 """
 
+import atexit
 import json
 import os
 import re
+import string
 import sys
-from datetime import datetime
-from pathlib import Path
+
+
+# ---------------------------------------------------------------------------
+# JSON I/O
+# ---------------------------------------------------------------------------
+
+
+def json_dumps_bytes(obj):
+    """Serialize obj to compact UTF-8 encoded JSON bytes."""
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def read_hook_input():
+    """Read and parse the hook's JSON payload from stdin as raw bytes.
+
+    json.loads detects the encoding of bytes input itself, so there is no
+    separate decode step.
+    """
+    return json.loads(sys.stdin.buffer.read())
+
+
+# PreToolUse responses have a fixed shape, so the envelope is pre-rendered and
+# only the two values are JSON-encoded per response.
+_PERMISSION_RESPONSE_TEMPLATE = (
+    b'{"hookSpecificOutput":{"hookEventName":"PreToolUse",'
+    b'"permissionDecision":%s,"permissionDecisionReason":%s}}\n'
+)
+
+
+def write_permission_decision(decision, reason):
+    """Write a PreToolUse permission decision to stdout as one line of JSON.
+
+    Args:
+        decision: "allow", "deny", or "ask".
+        reason: User-facing explanation.
+    """
+    sys.stdout.buffer.write(
+        _PERMISSION_RESPONSE_TEMPLATE
+        % (json_dumps_bytes(decision), json_dumps_bytes(reason))
+    )
+    sys.stdout.buffer.flush()
+
+
+# ---------------------------------------------------------------------------
+# Tool command names
+# ---------------------------------------------------------------------------
+
+# Command names to catch for each tool, keyed by the hooks' TOOL_NAME. Both the
+# validator (which stages to check) and the logger (which results to record)
+# read their tool's set from here, so a name added once is checked and logged.
+#
+# NOTE: Shell aliases (like `alias tf=terraform`) don't work in subprocess calls,
+# so they won't bypass these hooks anyway. These sets are for:
+# - The actual terraform/helm binaries
+# - Wrapper SCRIPTS in $PATH (e.g., ~/bin/tf)
+# - Common shorthand commands your team uses
+#
+# terraform defaults cover: terraform, tf, tform, tofu (OpenTofu)
+# Add your custom wrapper scripts here if needed (e.g., tfm, tfwrapper, etc.)
+TOOL_NAMES = {
+    "terraform": frozenset({"terraform", "tf", "tform", "tofu"}),
+    "helm": frozenset({"helm"}),
+}
+
+
+def compile_tool_names_re(tool_name):
+    """Compile a regex matching any of tool_name's command names as a word.
+
+    The pattern is lowercase (e.g. r'\\b(helm)\\b'), for searching a
+    lowercased command; see run_logger_hook.
+    """
+    names = sorted(TOOL_NAMES[tool_name])
+    return re.compile(rf"\b({'|'.join(map(re.escape, names))})\b")
 
 
 # ---------------------------------------------------------------------------
@@ -22,109 +100,343 @@ from pathlib import Path
 # Handles: ; | && || and newlines
 _SHELL_OP_RE = re.compile(r"\s*(?:&&|\|\||[;|\n])\s*")
 
-# Pattern to strip leading VAR=value env-var assignments from a stage.
-_ENV_PREFIX_RE = re.compile(r"^(?:\w+=\S+\s+)+")
+# Executable name of a stage: the leading word after any VAR=value env-var
+# assignments. Only ever applied with .match(), so the engine tries a single
+# start position instead of scanning, and always matches (possibly empty).
+_EXECUTABLE_RE = re.compile(r"(?:\w+=\S+\s+)*(\w*)")
 
+# Leading word of a token (see get_words), after any quotes or the opening of
+# a command substitution ($(, `, (, <(). Always matches, possibly empty.
+_WORD_RE = re.compile(r"[\"'$(<`]*([\w=-]*)")
 
-def get_tool_stages(command, tool_pattern):
+# Characters that separate keywords (see find_keywords): all ASCII
+# punctuation except the ones that can be part of a word ('-' and '_').
+_KEYWORD_SEPARATORS = str.maketrans(
+    dict.fromkeys(string.punctuation.replace("-", "").replace("_", ""), " ")
+)
+
+# The same split for commands with non-ASCII characters, which the translate
+# table does not cover.
+_KEYWORD_SEPARATOR_RE = re.compile(r"[^\w-]+")
+
+
+def get_tool_stages(cmd_lower, tool_names):
     """Return pipeline stages where the tool binary is the executable.
 
     Splits the command on shell operators and returns only stages where the
-    first token (after stripping any leading env var assignments) matches
-    tool_pattern. This prevents false positives when the tool name appears
+    first word (after stripping any leading env var assignments) is one of
+    tool_names. This prevents false positives when the tool name appears
     as incidental text inside arguments such as commit messages or comments.
 
+    Matching is case-insensitive: callers lowercase the command once and
+    each stage's executable name is looked up in tool_names, so adding names
+    costs nothing per stage. Most Bash commands never mention the tool at
+    all, so a plain substring check against tool_names rejects them before
+    any regex work.
+
     Args:
-        command: The full bash command string.
-        tool_pattern: Regex that identifies the tool binary (e.g. r'\\bhelm\\b').
+        cmd_lower: The full bash command string, already lowercased.
+        tool_names: Lowercase command names of the tool (e.g. {'helm'}).
 
     Returns:
-        List of stage strings where the tool is the executable.
+        List of (lowercase) stage strings where the tool is the executable.
     """
+    if not any(name in cmd_lower for name in tool_names):
+        return []
+
     tool_stages = []
-    for stage in _SHELL_OP_RE.split(command):
+    for stage in _SHELL_OP_RE.split(cmd_lower):
         stage = stage.strip()
         if not stage:
             continue
-        cleaned = _ENV_PREFIX_RE.sub("", stage).strip()
-        if re.match(tool_pattern, cleaned, re.IGNORECASE):
+        if _EXECUTABLE_RE.match(stage).group(1) in tool_names:
             tool_stages.append(stage)
     return tool_stages
 
 
+def get_words(stage):
+    """Split a lowercase pipeline stage into words for subcommand lookup.
+
+    Each whitespace-delimited token is reduced to its leading word: leading
+    quotes and command-substitution openers are dropped, and the word ends at
+    the first character that cannot be part of a command name, flag or
+    key=value pair. This way a nested call ('$(terraform', '`terraform') or a
+    redirect or closing quote glued to a subcommand still matches (e.g.
+    'apply>plan.log' -> 'apply'), while 'phase=install' stays one word.
+
+    Args:
+        stage: A single lowercase pipeline stage (see get_tool_stages).
+
+    Returns:
+        List of words, one per token (possibly empty strings).
+    """
+    return [_WORD_RE.match(token).group(1) for token in stage.split()]
+
+
+def find_keywords(cmd_lower, keywords):
+    """Return the keywords that appear as standalone words anywhere in cmd_lower.
+
+    Used to flag indirect execution of blocked subcommands (e.g.
+    subcmd="apply"; terraform $subcmd). Every character other than a word
+    character or '-' separates words (a single str.translate pass for ASCII
+    commands) and leading dashes are stripped from each word, so '\\apply',
+    '${X:-apply}' or '[apply]' count as 'apply'. A hyphenated word counts both
+    whole ('force-unlock') and as its '-'-separated parts, so 'pre-apply' or
+    'auto-destroy' count as 'apply' or 'destroy' (as \\b word boundaries
+    would). Underscores do join words, so 'apply_immediately' does not count.
+
+    Args:
+        cmd_lower: The full bash command string, already lowercased.
+        keywords: Lowercase keywords to look for, in reporting order.
+
+    Returns:
+        List of the matching keywords, in the order given.
+    """
+    if cmd_lower.isascii():
+        tokens = cmd_lower.translate(_KEYWORD_SEPARATORS).split()
+    else:
+        tokens = _KEYWORD_SEPARATOR_RE.split(cmd_lower)
+    words = set()
+    for token in tokens:
+        words.add(token.lstrip("-"))
+        if "-" in token:
+            words.update(token.split("-"))
+    return [kw for kw in keywords if kw in words]
+
+
 # ---------------------------------------------------------------------------
 # Audit logging
 # ---------------------------------------------------------------------------
 
 
+# Audit log paths computed by this process, keyed by tool name. Hooks are
+# short-lived, so the date is fixed at the first log call.
+_audit_log_paths = {}
+
+
 def get_dated_audit_log_path(tool_name):
     """Return a dated audit log path for automatic daily rotation.
 
+    The path is computed on first use and memoized for the process.
+
     Args:
         tool_name: Tool identifier used in the filename (e.g. 'terraform', 'helm').
 
     Returns:
-        pathlib.Path for .claude/audit/<tool_name>-YYYY-MM-DD.log
+        Path string for .claude/audit/<tool_name>-YYYY-MM-DD.log
     """
-    date_str = datetime.now().strftime("%Y-%m-%d")
-    audit_dir = Path(os.environ.get("CLAUDE_PROJECT_DIR", ".")) / ".claude" / "audit"
-    return audit_dir / f"{tool_name}-{date_str}.log"
+    audit_log = _audit_log_paths.get(tool_name)
+    if audit_log is None:
+        from datetime import datetime
 
+        date_str = datetime.now().strftime("%Y-%m-%d")
+        project_dir = os.environ.get("CLAUDE_PROJECT_DIR", ".")
+        audit_dir = os.path.join(project_dir, ".claude", "audit")
+        audit_log = os.path.join(audit_dir, f"{tool_name}-{date_str}.log")
+        _audit_log_paths[tool_name] = audit_log
+    return audit_log
 
-def log_command(audit_log, command, decision, cwd, reason=""):
+
+# Audit lines queued during this process, keyed by log path. They are written
+# by flush_audit_logs() at interpreter exit so each hook invocation costs one
+# open/write/close per log file no matter how many entries it records.
+_pending_audit_lines = {}
+
+# Flags for appending to an audit log through a raw fd: no Python buffering or
+# text codec, and O_APPEND makes each single write atomic. os.open already adds
+# O_CLOEXEC where supported (PEP 446); it is spelled out to make that explicit.
+_AUDIT_OPEN_FLAGS = (
+    os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_CLOEXEC", 0)
+)
+
+
+# Audit entries have a fixed schema, so the keys and punctuation are baked into
+# byte templates and only the values are JSON-encoded per entry. Key order
+# matches the dicts these entries used to be serialized from.
+_COMMAND_ENTRY_TEMPLATE = (
+    b'{"timestamp":"%s","command":%s,"decision":%s,"working_dir":%s,'
+    b'"reason":%s}\n'
+)
+_RESULT_ENTRY_TEMPLATE = (
+    b'{"timestamp":"%s","command":%s,"decision":%s,"working_dir":%s,'
+    b'"exit_code":%s,"success":%s}\n'
+)
+
+
+def _timestamp():
+    """Return the current local time as ASCII ISO 8601 bytes (milliseconds)."""
+    from datetime import datetime
+
+    return datetime.now().isoformat(timespec="milliseconds").encode()
+
+
+def _queue_audit_line(tool_name, line):
+    """Queue a serialized audit line for the next flush_audit_logs()."""
+    audit_log = get_dated_audit_log_path(tool_name)
+    _pending_audit_lines.setdefault(audit_log, []).append(line)
+
+
+def flush_audit_logs():
+    """Write all queued audit lines, one os.write() per log file.
+
+    The file is opened with O_APPEND, so each single write lands atomically at
+    the end of the file even when several hook processes append concurrently.
+    Registered with atexit, so it also runs on sys.exit().
+    """
+    while _pending_audit_lines:
+        audit_log, lines = _pending_audit_lines.popitem()
+        try:
+            os.makedirs(os.path.dirname(audit_log), exist_ok=True)
+            fd = os.open(audit_log, _AUDIT_OPEN_FLAGS, 0o644)
+            try:
+                os.write(fd, b"".join(lines))
+            finally:
+                os.close(fd)
+        except Exception as e:
+            print(f"Warning: Could not write to audit log: {e}", file=sys.stderr)
+
+
+atexit.register(flush_audit_logs)
+
+
+def log_command(tool_name, command, decision, cwd, reason=""):
     """Log a validator command attempt to the audit file with a timestamp.
 
+    The entry is queued and written when the process exits (see
+    flush_audit_logs).
+
     Args:
-        audit_log: pathlib.Path for the audit log file.
+        tool_name: Tool identifier selecting the audit log (see
+            get_dated_audit_log_path).
         command: The command that was attempted.
         decision: BLOCKED, PENDING_APPROVAL, APPROVED, or DENIED.
         cwd: Current working directory.
         reason: Human-readable reason for the decision.
     """
-    audit_log.parent.mkdir(parents=True, exist_ok=True)
-
-    log_entry = {
-        "timestamp": datetime.now().isoformat(),
-        "command": command,
-        "decision": decision,
-        "working_dir": cwd,
-        "reason": reason,
-    }
-
-    try:
-        with open(audit_log, "a") as f:
-            f.write(json.dumps(log_entry) + "\n")
-    except Exception as e:
-        print(f"Warning: Could not write to audit log: {e}", file=sys.stderr)
+    line = _COMMAND_ENTRY_TEMPLATE % (
+        _timestamp(),
+        json_dumps_bytes(command),
+        json_dumps_bytes(decision),
+        json_dumps_bytes(cwd),
+        json_dumps_bytes(reason),
+    )
+    _queue_audit_line(tool_name, line)
 
 
-def log_result(audit_log, command, cwd, success, exit_code):
+def log_result(tool_name, command, cwd, success, exit_code):
     """Log a logger command result to the audit file with a timestamp.
 
+    The entry is queued and written when the process exits (see
+    flush_audit_logs).
+
     Args:
-        audit_log: pathlib.Path for the audit log file.
+        tool_name: Tool identifier selecting the audit log (see
+            get_dated_audit_log_path).
         command: The command that was executed.
         cwd: Current working directory.
         success: Whether the command succeeded.
         exit_code: The command's exit code.
     """
-    audit_log.parent.mkdir(parents=True, exist_ok=True)
-
     status = "COMPLETED_SUCCESS" if success else "COMPLETED_FAILURE"
-    log_entry = {
-        "timestamp": datetime.now().isoformat(),
-        "command": command,
-        "decision": status,
-        "working_dir": cwd,
-        "exit_code": exit_code,
-        "success": success,
-    }
+    line = _RESULT_ENTRY_TEMPLATE % (
+        _timestamp(),
+        json_dumps_bytes(command),
+        json_dumps_bytes(status),
+        json_dumps_bytes(cwd),
+        json_dumps_bytes(exit_code),
+        json_dumps_bytes(success),
+    )
+    _queue_audit_line(tool_name, line)
+
+
+# ---------------------------------------------------------------------------
+# Hook entry points
+# ---------------------------------------------------------------------------
+
+
+def run_validator_hook(check_command):
+    """Run a PreToolUse validator hook and exit.
+
+    Reads the hook payload from stdin, passes Bash commands to check_command
+    and writes the permission decision to stdout.
+
+    Args:
+        check_command: Callable (command, cwd) -> (decision, reason, should_block).
+    """
+    try:
+        input_data = read_hook_input()
+    except ValueError as e:  # JSONDecodeError, or UnicodeDecodeError on bad bytes
+        print(f"Error: Invalid JSON input from Claude Code: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    tool_name = input_data.get("tool_name", "")
+    tool_input = input_data.get("tool_input", {})
+    command = tool_input.get("command", "")
+    cwd = input_data.get("cwd", os.getcwd())
+
+    if tool_name != "Bash":
+        sys.exit(0)
+
+    decision, reason, should_block = check_command(command, cwd)
+
+    write_permission_decision(decision, reason)
+
+    # Exit code 2 blocks command with error message
+    # Exit code 0 uses JSON response
+    if should_block:
+        sys.exit(2)
+
+    sys.exit(0)
+
+
+def run_logger_hook(tool_name, tool_pattern):
+    """Run a PostToolUse logger hook and exit.
+
+    Reads the hook payload from stdin and records the result of Bash commands
+    that mention the tool anywhere. This is deliberately broader than the
+    validator's get_tool_stages: forms the validator lets through unprompted
+    (e.g. sudo helm install, bash -c 'helm upgrade ...') still leave an audit
+    entry. Never fails the workflow: bad input only prints an error and
+    exits 0.
+
+    Args:
+        tool_name: Tool identifier selecting the audit log (e.g. 'helm').
+        tool_pattern: Compiled lowercase regex matching the tool's command
+            names as words (see compile_tool_names_re).
+    """
+    data = sys.stdin.buffer.read()
+
+    # Fast path: a Bash payload always contains the quoted tool name "Bash",
+    # so anything without it is skipped without parsing. This is only a
+    # pre-filter -- the tool_name check below still decides for the rest.
+    if b'"Bash"' not in data:
+        sys.exit(0)
 
     try:
-        with open(audit_log, "a") as f:
-            f.write(json.dumps(log_entry) + "\n")
-    except Exception as e:
-        print(f"Warning: Could not write to audit log: {e}", file=sys.stderr)
+        input_data = json.loads(data)
+    except ValueError as e:  # JSONDecodeError, or UnicodeDecodeError on bad bytes
+        print(f"Error: Invalid JSON input from Claude Code: {e}", file=sys.stderr)
+        sys.exit(0)  # Don't fail the workflow on logging errors
+
+    tool_input = input_data.get("tool_input", {})
+    tool_response = input_data.get("tool_response", {})
+    cwd = input_data.get("cwd", os.getcwd())
+    command = tool_input.get("command", "")
+
+    # Only log the tool's commands executed via Bash tool
+    if input_data.get("tool_name", "") != "Bash" or not tool_pattern.search(
+        command.lower()
+    ):
+        sys.exit(0)
+
+    success = tool_response.get("success", False)
+    exit_code = tool_response.get("exit_code", "unknown")
+
+    # Note: PostToolUse only fires after execution. If a PreToolUse hook blocked
+    # the command, this hook never runs -- so every logged command was approved.
+    log_result(tool_name, command, cwd, success, exit_code)
+
+    sys.exit(0)
 
 
 # ---------------------------------------------------------------------------
@@ -16,55 +16,89 @@ Usage:
 Author: SRE Platform Team
 """
 
-import json
 import sys
 import re
 import os
-from pathlib import Path
 
 # Allow import from the same directory when invoked as a standalone script.
-sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from hook_utils import (
-    get_dated_audit_log_path,
+    TOOL_NAMES,
+    find_keywords,
     get_tool_stages,
+    get_words,
     log_command,
+    run_validator_hook,
 )
 
-AUDIT_LOG = get_dated_audit_log_path("terraform")
+# Audit log selector: entries go to .claude/audit/terraform-YYYY-MM-DD.log
+TOOL_NAME = "terraform"
 
-# Terraform command names to catch
-#
-# NOTE: Shell aliases (like `alias tf=terraform`) don't work in subprocess calls,
-# so they won't bypass these hooks anyway. This list is for:
-# - The actual terraform binary
-# - Wrapper SCRIPTS in $PATH (e.g., ~/bin/tf)
-# - Common shorthand commands your team uses
+# Terraform command names to catch. Add wrapper scripts to TOOL_NAMES in
+# hook_utils.py, which terraform-logger.py reads too.
+TF_NAMES = TOOL_NAMES[TOOL_NAME]
+
+# Subcommands that are absolutely forbidden, mapped to their display names.
 #
-# Default list covers: terraform, tf, tform, tofu (OpenTofu)
-# Add your custom wrapper scripts here if needed (e.g., tfm, tfwrapper, etc.)
-TF_COMMAND = r"\b(terraform|tf|tform|tofu)\b"
-
-# Terraform global flags use = syntax for values (e.g., -chdir=DIR),
-# so any -prefixed token is self-contained (no space-separated values to skip).
-# This gap pattern allows matching commands like: terraform -chdir=../prod apply
-TF_FLAGS_GAP = r"(?:\s+-\S+)*"
-
-# Commands that are absolutely forbidden
-BLOCKED_COMMANDS = [
-    (rf"{TF_COMMAND}{TF_FLAGS_GAP}\s+apply\b", "terraform apply"),
-    (rf"{TF_COMMAND}{TF_FLAGS_GAP}\s+destroy\b", "terraform destroy"),
-    (rf"{TF_COMMAND}{TF_FLAGS_GAP}\s+import\b", "terraform import"),
-    (
-        rf"{TF_COMMAND}{TF_FLAGS_GAP}\s+state\s+(rm|mv|push|pull)\b",
-        "terraform state manipulation (rm/mv/push/pull)",
-    ),
-    (rf"{TF_COMMAND}{TF_FLAGS_GAP}\s+taint\b", "terraform taint"),
-    (rf"{TF_COMMAND}{TF_FLAGS_GAP}\s+untaint\b", "terraform untaint"),
-    (rf"{TF_COMMAND}{TF_FLAGS_GAP}\s+force-unlock\b", "terraform force-unlock"),
+# Terraform global flags use = syntax for values (e.g., -chdir=DIR), so any
+# -prefixed word is self-contained and the subcommand is the first non-flag
+# word after the command name (e.g., terraform -chdir=../prod apply).
+BLOCKED_SUBCOMMANDS = {
+    "apply": "terraform apply",
+    "destroy": "terraform destroy",
+    "import": "terraform import",
+    "taint": "terraform taint",
+    "untaint": "terraform untaint",
+    "force-unlock": "terraform force-unlock",
+}
+
+# `terraform state <op>` operations that are forbidden
+BLOCKED_STATE_OPS = frozenset({"rm", "mv", "push", "pull"})
+BLOCKED_STATE_NAME = "terraform state manipulation (rm/mv/push/pull)"
+
+# Extra rules that can't be expressed as a subcommand name (e.g. a flag),
+# as (compiled regex, display name) pairs. Each is searched in every stage
+# where terraform is the executable, after the subcommand lookup. Stages are
+# lowercased, so write lowercase patterns without re.IGNORECASE. Empty by
+# default; see .claude/docs/DEPLOYMENT.md for an example.
+BLOCKED_PATTERNS = [
+    # (re.compile(r"(^|\s)-auto-approve\b"), "terraform with -auto-approve flag"),
 ]
 
-# All other terraform commands require user approval
-TERRAFORM_PATTERN = TF_COMMAND
+# Blocked subcommand keywords that may appear via indirection (variables, eval)
+SUSPICIOUS_KEYWORDS = ("apply", "destroy", "taint", "untaint", "force-unlock")
+
+
+def find_blocked(stage):
+    """Return the display name of the blocked command run by stage, or None.
+
+    Scans the stage's words once: for each terraform command name, skips
+    global flags and looks the subcommand up in BLOCKED_SUBCOMMANDS (or
+    BLOCKED_STATE_OPS for `state <op>`). Then tries BLOCKED_PATTERNS.
+    """
+    words = get_words(stage)
+    for i, word in enumerate(words):
+        if word not in TF_NAMES:
+            continue
+        j = i + 1
+        while j < len(words) and words[j].startswith("-"):
+            j += 1
+        if j == len(words):
+            continue
+        subcmd = words[j]
+        name = BLOCKED_SUBCOMMANDS.get(subcmd)
+        if name:
+            return name
+        if (
+            subcmd == "state"
+            and j + 1 < len(words)
+            and words[j + 1] in BLOCKED_STATE_OPS
+        ):
+            return BLOCKED_STATE_NAME
+    for pattern, name in BLOCKED_PATTERNS:
+        if pattern.search(stage):
+            return name
+    return None
 
 
 def check_command(command, cwd):
@@ -82,35 +116,35 @@ def check_command(command, cwd):
             should_block: If True, command is completely blocked
     """
 
+    # Lowercase once; every check below works on this copy, while the reason
+    # and audit log keep the command as written.
+    cmd_lower = command.lower()
+
     # Only validate commands where terraform is actually the executable in at
     # least one pipeline stage. This prevents false positives when 'terraform'
     # appears as text inside arguments (e.g. commit messages, file paths).
-    tool_stages = get_tool_stages(command, TERRAFORM_PATTERN)
+    tool_stages = get_tool_stages(cmd_lower, TF_NAMES)
     if not tool_stages:
         return ("allow", "", False)
 
-    # Check blocked patterns against tool stages only (not the full command
+    # Check for blocked subcommands in tool stages only (not the full command
     # string) to avoid matching blocked keywords in unrelated text.
     for stage in tool_stages:
-        for pattern, name in BLOCKED_COMMANDS:
-            if re.search(pattern, stage, re.IGNORECASE):
-                reason = (
-                    f"BLOCKED: {name} is not allowed.\n\n"
-                    f"This command can modify infrastructure state and must go through "
-                    f"your standard PR review workflow.\n\n"
-                    f"Working directory: {cwd}"
-                )
-                log_command(AUDIT_LOG, command, "BLOCKED", cwd, f"Blocked: {name}")
-                return ("deny", reason, True)
+        name = find_blocked(stage)
+        if name:
+            reason = (
+                f"BLOCKED: {name} is not allowed.\n\n"
+                f"This command can modify infrastructure state and must go through "
+                f"your standard PR review workflow.\n\n"
+                f"Working directory: {cwd}"
+            )
+            log_command(TOOL_NAME, command, "BLOCKED", cwd, f"Blocked: {name}")
+            return ("deny", reason, True)
 
     # Check if the command contains blocked subcommand keywords despite not
     # matching the structured block patterns. This catches indirect execution
     # via variables or eval (e.g., subcmd="apply"; terraform $subcmd).
-    suspicious = [
-        kw
-        for kw in ("apply", "destroy", "taint", "untaint", "force-unlock")
-        if re.search(rf"\b{kw}\b", command, re.IGNORECASE)
-    ]
+    suspicious = find_keywords(cmd_lower, SUSPICIOUS_KEYWORDS)
 
     if suspicious:
         keywords = ", ".join(suspicious)
@@ -123,7 +157,7 @@ def check_command(command, cwd):
             f"blocked operation. Review the full command carefully before approving."
         )
         log_command(
-            AUDIT_LOG,
+            TOOL_NAME,
             command,
             "PENDING_APPROVAL_SUSPICIOUS",
             cwd,
@@ -137,7 +171,7 @@ def check_command(command, cwd):
             f"This prompt ensures you review each terraform operation before execution."
         )
         log_command(
-            AUDIT_LOG, command, "PENDING_APPROVAL", cwd, "Awaiting user approval"
+            TOOL_NAME, command, "PENDING_APPROVAL", cwd, "Awaiting user approval"
         )
 
     return ("ask", reason, False)
@@ -145,38 +179,7 @@ def check_command(command, cwd):
 
 def main():
     """Main hook execution function."""
-    try:
-        input_data = json.load(sys.stdin)
-    except json.JSONDecodeError as e:
-        print(f"Error: Invalid JSON input from Claude Code: {e}", file=sys.stderr)
-        sys.exit(1)
-
-    tool_name = input_data.get("tool_name", "")
-    tool_input = input_data.get("tool_input", {})
-    command = tool_input.get("command", "")
-    cwd = input_data.get("cwd", os.getcwd())
-
-    if tool_name != "Bash":
-        sys.exit(0)
-
-    decision, reason, should_block = check_command(command, cwd)
-
-    response = {
-        "hookSpecificOutput": {
-            "hookEventName": "PreToolUse",
-            "permissionDecision": decision,
-            "permissionDecisionReason": reason,
-        }
-    }
-
-    print(json.dumps(response))
-
-    # Exit code 2 blocks command with error message
-    # Exit code 0 uses JSON response
-    if should_block:
-        sys.exit(2)
-
-    sys.exit(0)
+    run_validator_hook(check_command)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,178 @@
+"""Tests for hook_utils.py audit log entries, PreToolUse responses and the
+loggers' command name patterns.
+
+Entries and responses are rendered from byte templates rather than json.dumps
+of a dict, so these tests parse the output back with json.loads.
+"""
+
+import json
+from datetime import datetime
+
+import pytest
+
+# Values that need escaping: quotes, backslashes, control characters and
+# non-ASCII text
+AWKWARD_STRINGS = (
+    "terraform plan -var='name=\"prod\"'",
+    'helm install x --set a="b\\c"\necho done\r\n\ttail',
+    "terraform plan -var=owner=Zoë # ☃ ✓",
+    "",
+)
+AWKWARD_IDS = ("quotes", "escapes", "non-ascii", "empty")
+
+COMMAND_ENTRY_KEYS = ["timestamp", "command", "decision", "working_dir", "reason"]
+RESULT_ENTRY_KEYS = [
+    "timestamp",
+    "command",
+    "decision",
+    "working_dir",
+    "exit_code",
+    "success",
+]
+
+
+@pytest.fixture
+def audit_dir(hook_utils, tmp_path, monkeypatch):
+    """Send audit logs to tmp_path/.claude/audit with an empty write queue."""
+    monkeypatch.setenv("CLAUDE_PROJECT_DIR", str(tmp_path))
+    monkeypatch.setattr(hook_utils, "_audit_log_paths", {})
+    monkeypatch.setattr(hook_utils, "_pending_audit_lines", {})
+    return tmp_path / ".claude" / "audit"
+
+
+def read_entries(audit_dir, tool_name):
+    """Parse every line of today's audit log for tool_name."""
+    date_str = datetime.now().strftime("%Y-%m-%d")
+    text = (audit_dir / f"{tool_name}-{date_str}.log").read_text(encoding="utf-8")
+    assert text.endswith("\n")
+    return [json.loads(line) for line in text.splitlines()]
+
+
+# ---------------------------------------------------------------------------
+# Audit log entries
+# ---------------------------------------------------------------------------
+
+
+class TestLogCommand:
+    def test_entries_round_trip(self, hook_utils, audit_dir):
+        for value in AWKWARD_STRINGS:
+            hook_utils.log_command("terraform", value, "BLOCKED", value, value)
+        hook_utils.flush_audit_logs()
+
+        entries = read_entries(audit_dir, "terraform")
+        assert len(entries) == len(AWKWARD_STRINGS)
+        for entry, value in zip(entries, AWKWARD_STRINGS):
+            assert list(entry) == COMMAND_ENTRY_KEYS
+            assert entry["command"] == value
+            assert entry["decision"] == "BLOCKED"
+            assert entry["working_dir"] == value
+            assert entry["reason"] == value
+            datetime.fromisoformat(entry["timestamp"])
+
+    def test_reason_defaults_to_empty(self, hook_utils, audit_dir):
+        hook_utils.log_command("helm", "helm lint .", "PENDING_APPROVAL", "/w")
+        hook_utils.flush_audit_logs()
+
+        (entry,) = read_entries(audit_dir, "helm")
+        assert entry["reason"] == ""
+
+
+class TestLogResult:
+    @pytest.mark.parametrize(
+        "exit_code",
+        [
+            pytest.param(0, id="zero"),
+            pytest.param(2, id="nonzero"),
+            pytest.param(None, id="none"),
+            pytest.param("unknown", id="unknown"),
+            pytest.param({"signal": "SIGTERM", "code": None}, id="dict"),
+        ],
+    )
+    def test_entries_round_trip(self, hook_utils, audit_dir, exit_code):
+        for value in AWKWARD_STRINGS:
+            hook_utils.log_result("helm", value, value, True, exit_code)
+        hook_utils.log_result("helm", "helm lint .", "/w", False, exit_code)
+        hook_utils.flush_audit_logs()
+
+        entries = read_entries(audit_dir, "helm")
+        assert len(entries) == len(AWKWARD_STRINGS) + 1
+        for entry, value in zip(entries, AWKWARD_STRINGS):
+            assert list(entry) == RESULT_ENTRY_KEYS
+            assert entry["command"] == value
+            assert entry["decision"] == "COMPLETED_SUCCESS"
+            assert entry["working_dir"] == value
+            assert entry["exit_code"] == exit_code
+            assert entry["success"] is True
+            datetime.fromisoformat(entry["timestamp"])
+        assert entries[-1]["decision"] == "COMPLETED_FAILURE"
+        assert entries[-1]["success"] is False
+
+
+class TestFlushAuditLogs:
+    def test_appends_per_tool_log(self, hook_utils, audit_dir):
+        hook_utils.log_command("terraform", "terraform plan", "PENDING_APPROVAL", "/w")
+        hook_utils.log_command("helm", "helm lint .", "PENDING_APPROVAL", "/w")
+        hook_utils.flush_audit_logs()
+        hook_utils.log_command("terraform", "terraform apply", "BLOCKED", "/w")
+        hook_utils.flush_audit_logs()
+
+        commands = [e["command"] for e in read_entries(audit_dir, "terraform")]
+        assert commands == ["terraform plan", "terraform apply"]
+        assert [e["command"] for e in read_entries(audit_dir, "helm")] == [
+            "helm lint ."
+        ]
+
+    def test_empty_queue_writes_nothing(self, hook_utils, audit_dir):
+        hook_utils.flush_audit_logs()
+        assert not audit_dir.exists()
+
+    def test_write_failure_only_warns(self, hook_utils, audit_dir, capsys):
+        # A file where the audit directory should be makes the write fail
+        audit_dir.parent.mkdir(parents=True)
+        audit_dir.write_text("")
+        hook_utils.log_command("helm", "helm lint .", "PENDING_APPROVAL", "/w")
+        hook_utils.flush_audit_logs()
+
+        assert "Could not write to audit log" in capsys.readouterr().err
+        assert not hook_utils._pending_audit_lines
+
+
+# ---------------------------------------------------------------------------
+# PreToolUse response
+# ---------------------------------------------------------------------------
+
+
+class TestWritePermissionDecision:
+    @pytest.mark.parametrize("decision", ["allow", "deny", "ask"])
+    @pytest.mark.parametrize("reason", AWKWARD_STRINGS, ids=AWKWARD_IDS)
+    def test_response_round_trips(self, hook_utils, capsysbinary, decision, reason):
+        hook_utils.write_permission_decision(decision, reason)
+        out = capsysbinary.readouterr().out
+
+        assert out.endswith(b"\n")
+        assert out.count(b"\n") == 1
+        response = json.loads(out)
+        assert list(response) == ["hookSpecificOutput"]
+        output = response["hookSpecificOutput"]
+        assert list(output) == [
+            "hookEventName",
+            "permissionDecision",
+            "permissionDecisionReason",
+        ]
+        assert output["hookEventName"] == "PreToolUse"
+        assert output["permissionDecision"] == decision
+        assert output["permissionDecisionReason"] == reason
+
+
+# ---------------------------------------------------------------------------
+# Logger command name patterns
+# ---------------------------------------------------------------------------
+
+
+class TestCompileToolNamesRe:
+    @pytest.mark.parametrize("tool_name", ["terraform", "helm"])
+    def test_matches_every_name_as_word(self, hook_utils, tool_name):
+        pattern = hook_utils.compile_tool_names_re(tool_name)
+        for name in hook_utils.TOOL_NAMES[tool_name]:
+            assert pattern.search(f"sudo {name} version")
+            assert not pattern.search(f"{name}x version")
@@ -0,0 +1,236 @@
+"""Tests for the helm and terraform validators' check_command() logic.
+
+Every test runs once per validator (see the validator fixture in conftest.py)
+against that validator's case tables in _cases.py.
+"""
+
+import functools
+import re
+from contextlib import ExitStack
+from unittest.mock import patch
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def check_command(validator):
+    """The validator's check_command(), memoized for its tests.
+
+    log_command is a no-op here (see the validator fixture), so repeat inputs
+    can reuse the result. Tests that must exercise the real call use the
+    module's check_command directly.
+    """
+    module, _, _ = validator
+    return functools.lru_cache(maxsize=512)(module.check_command)
+
+
+@pytest.fixture(scope="module")
+def cwd(validator):
+    """Working directory passed to check_command()."""
+    return validator[1]
+
+
+@pytest.fixture(scope="module")
+def cases(validator):
+    """The validator's case tables, keyed by category."""
+    return validator[2]
+
+
+# _suppress_container_warning fixture is provided by conftest.py
+
+
+def check_many(check_command, cases, cwd, decision, reason_marker):
+    """Run check_command over (cmd, id) cases in one plain loop.
+
+    Returns (id, cmd, result) for every case whose decision differs, whose
+    should_block doesn't match a "deny" decision, or whose reason lacks
+    reason_marker (an empty marker requires an empty reason).
+    """
+    should_block = decision == "deny"
+    mismatches = []
+    for cmd, case_id in cases:
+        result = check_command(cmd, cwd)
+        got_decision, reason, blocked = result
+        if (
+            got_decision != decision
+            or blocked is not should_block
+            or (reason_marker not in reason if reason_marker else reason)
+        ):
+            mismatches.append((case_id, cmd, result))
+    return mismatches
+
+
+# ---------------------------------------------------------------------------
+# Blocked commands  (decision="deny", should_block=True)
+# ---------------------------------------------------------------------------
+
+
+class TestBlockedCommands:
+    """Commands that must be denied outright."""
+
+    def test_blocked_batch(self, check_command, cases, cwd):
+        mismatches = check_many(
+            check_command, cases["blocked"], cwd, "deny", "BLOCKED"
+        )
+        assert not mismatches, mismatches
+
+    def test_bare_blocked(self, check_command, cases, cwd):
+        cmd, _ = cases["blocked"][0]
+        decision, reason, blocked = check_command(cmd, cwd)
+        assert decision == "deny"
+        assert blocked is True
+        assert "BLOCKED" in reason
+
+
+# ---------------------------------------------------------------------------
+# Prompted commands  (decision="ask", should_block=False)
+# ---------------------------------------------------------------------------
+
+
+class TestPromptedCommands:
+    """Safe commands that require user approval."""
+
+    def test_prompted_batch(self, check_command, cases, cwd):
+        mismatches = check_many(
+            check_command, cases["prompted"], cwd, "ask", "requires approval"
+        )
+        assert not mismatches, mismatches
+
+    def test_safe_commands_prompt(self, check_command, cases, cwd):
+        cmd, _ = cases["prompted"][0]
+        decision, reason, blocked = check_command(cmd, cwd)
+        assert decision == "ask"
+        assert blocked is False
+        assert "requires approval" in reason
+        assert "WARNING" not in reason
+
+
+# ---------------------------------------------------------------------------
+# Non-matching commands  (decision="allow", should_block=False)
+# ---------------------------------------------------------------------------
+
+
+class TestNonMatchingCommands:
+    """Commands in which the tool is not the executable."""
+
+    def test_non_matching_batch(self, check_command, cases, cwd):
+        mismatches = check_many(check_command, cases["non_matching"], cwd, "allow", "")
+        assert not mismatches, mismatches
+
+    def test_unrelated_allowed(self, check_command, cases, cwd):
+        cmd, _ = cases["non_matching"][0]
+        decision, reason, blocked = check_command(cmd, cwd)
+        assert decision == "allow"
+        assert reason == ""
+        assert blocked is False
+
+
+# ---------------------------------------------------------------------------
+# Suspicious keyword detection
+# ---------------------------------------------------------------------------
+
+
+class TestSuspiciousKeywords:
+    """Indirection patterns that contain blocked keywords without matching
+    the structured block patterns."""
+
+    def test_suspicious_batch(self, check_command, cases, cwd):
+        mismatches = check_many(
+            check_command, cases["suspicious"], cwd, "ask", "WARNING"
+        )
+        assert not mismatches, mismatches
+
+    def test_suspicious_warned(self, check_command, cases, cwd):
+        cmd, _ = cases["suspicious"][0]
+        decision, reason, blocked = check_command(cmd, cwd)
+        assert decision == "ask"
+        assert blocked is False
+        assert "WARNING" in reason
+        assert "blocked operation" in reason
+
+
+# ---------------------------------------------------------------------------
+# Custom blocked patterns
+# ---------------------------------------------------------------------------
+
+
+class TestBlockedPatterns:
+    """BLOCKED_PATTERNS entries deny tool stages the subcommand lookup lets
+    through, and only tool stages."""
+
+    @pytest.fixture
+    def module(self, validator, monkeypatch):
+        """The validator module with one custom flag rule installed."""
+        module, _, _ = validator
+        pattern = re.compile(r"(^|\s)--custom-flag\b")
+        monkeypatch.setattr(module, "BLOCKED_PATTERNS", [(pattern, "custom flag")])
+        return module
+
+    # These call the module directly: the memoized check_command fixture would
+    # return results computed without the custom rule.
+
+    def test_pattern_blocks_tool_stage(self, module, cases, cwd):
+        cmd, _ = cases["prompted"][0]
+        decision, reason, blocked = module.check_command(f"{cmd} --CUSTOM-FLAG", cwd)
+        assert decision == "deny"
+        assert blocked is True
+        assert "custom flag" in reason
+
+    def test_pattern_ignores_other_stages(self, module, cases, cwd):
+        cmd, _ = cases["prompted"][0]
+        decision, _, blocked = module.check_command(
+            f"echo --custom-flag && {cmd}", cwd
+        )
+        assert decision == "ask"
+        assert blocked is False
+
+
+# ---------------------------------------------------------------------------
+# Custom command names
+# ---------------------------------------------------------------------------
+
+
+class TestCommandNames:
+    """Wrapper names added to the validator's command name set are checked
+    like the tool itself."""
+
+    def test_added_name_blocked(self, validator, cases, cwd, monkeypatch):
+        module, _, _ = validator
+        attr = "HELM_NAMES" if hasattr(module, "HELM_NAMES") else "TF_NAMES"
+        monkeypatch.setattr(module, attr, getattr(module, attr) | {"wrapper"})
+        cmd, _ = cases["blocked"][0]
+        _, args = cmd.split(" ", 1)
+        # Called directly: the memoized fixture predates the added name
+        decision, reason, blocked = module.check_command(
+            f"wrapper --debug {args}", cwd
+        )
+        assert decision == "deny"
+        assert blocked is True
+        assert "BLOCKED" in reason
+
+
+# ---------------------------------------------------------------------------
+# Precompiled patterns
+# ---------------------------------------------------------------------------
+
+
+class TestPrecompiledPatterns:
+    """check_command() runs on every Bash tool call and must only use
+    patterns compiled at import time."""
+
+    def test_no_regex_compilation_per_call(self, validator):
+        module, cwd, cases = validator
+        # One command per category, run uncached so each really goes through
+        # the validator
+        cmds = [table[0][0] for table in cases.values()]
+        # The module-level re functions compile (or look up) a pattern on every
+        # call; precompiled pattern methods don't go through them.
+        re_functions = ("compile", "search", "match", "fullmatch", "findall")
+        re_functions += ("sub", "split")
+        with ExitStack() as stack:
+            for fn in re_functions:
+                stack.enter_context(
+                    patch(f"re.{fn}", side_effect=AssertionError(f"re.{fn} called"))
+                )
+            for cmd in cmds:
+                module.check_command(cmd, cwd)